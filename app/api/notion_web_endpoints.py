@@ -6,15 +6,20 @@
 from fastapi import APIRouter, HTTPException, Depends, Request
 from fastapi.responses import Response
 from pydantic import BaseModel
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Hashable
 import os
 import json
 import asyncio
+import httpx
 import time
-from datetime import datetime, timezone
-from functools import wraps
+import hashlib
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timezone
+from functools import wraps, partial
 
 from notion_client import Client
+from notion_client.errors import HTTPResponseError
 from app.core.config import get_settings
 from app.services.financial_wisdom_service import AIContentGenerationService
 from slowapi import Limiter, _rate_limit_exceeded_handler
@@ -71,7 +76,7 @@ class AIUsageTracker:
             'monthly_calls': 0,
             'total_calls': 0,
             'last_reset_date': datetime.now(timezone.utc).date(),
-            'response_times': [],
+            'response_times': deque(maxlen=100),  # 只保留最近100次記錄
             'error_count': 0,
             'success_count': 0
         }
@@ -92,8 +97,6 @@ class AIUsageTracker:
 
         # 記錄響應時間
         self._usage_data['response_times'].append(response_time_ms)
-        if len(self._usage_data['response_times']) > 100:  # 只保留最近100次記錄
-            self._usage_data['response_times'] = self._usage_data['response_times'][-100:]
 
         # 記錄成功/失敗
         if success:
@@ -125,6 +128,71 @@ class AIUsageTracker:
 # 全局 AI 使用量追蹤器
 ai_usage_tracker = AIUsageTracker()
 
+# 容量有限的 TTL 缓存（鍵來自用戶輸入時使用，避免無限增長）
+class BoundedTTLCache:
+    def __init__(self, ttl: int, max_entries: int):
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._ttl = ttl
+        self._max_entries = max_entries
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires, value = entry
+        if time.time() >= expires:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._entries[key] = (time.time() + self._ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+# 重複保存去重（上游重試時避免建立重複頁面）
+class SaveDeduplicator:
+    def __init__(self, ttl: int = 3600, max_entries: int = 10000):
+        self._saved = BoundedTTLCache(ttl=ttl, max_entries=max_entries)
+        self._in_flight: Dict[bytes, "asyncio.Future"] = {}
+
+    @staticmethod
+    def make_key(title: str, content: str) -> bytes:
+        """以標題和完整內容計算穩定的雜湊鍵"""
+        payload = f"{title}|{content}".encode('utf-8')
+        return hashlib.blake2b(payload, digest_size=16).digest()
+
+    def get(self, key: bytes) -> Optional[str]:
+        """返回 TTL 內已保存的頁面 ID"""
+        return self._saved.get(key)
+
+    def set(self, key: bytes, page_id: str) -> None:
+        self._saved.set(key, page_id)
+
+    def claim(self, key: bytes) -> Optional["asyncio.Future"]:
+        """登記進行中的保存；若相同文章已在保存中，返回其 Future 供等待"""
+        pending = self._in_flight.get(key)
+        if pending is not None:
+            return pending
+        self._in_flight[key] = asyncio.get_running_loop().create_future()
+        return None
+
+    def release(self, key: bytes, page_id: Optional[str]) -> None:
+        """結束進行中的保存；page_id 為 None 表示保存失敗，等待者需自行重試"""
+        pending = self._in_flight.pop(key, None)
+        if page_id is not None:
+            self.set(key, page_id)
+        if pending is not None and not pending.done():
+            pending.set_result(page_id)
+
+# 全局保存去重器
+save_deduplicator = SaveDeduplicator(ttl=3600)
+
 # 缓存裝飾器
 def cached(ttl: int = 300, key_prefix: str = ""):
     def decorator(func):
@@ -186,22 +254,279 @@ class GeneratedArticleResponse(BaseModel):
     quality_score: float
     prompt_used: Optional[str] = None
 
-# Notion 客戶端初始化
+# Notion 資料庫屬性名稱
+PROP_TITLE = '文章標題'
+PROP_CATEGORY = '主題類別'
+PROP_STATUS = '發布狀態'
+PROP_TAGS = '標籤'
+PROP_WORD_COUNT = '字數'
+PROP_READING_TIME = '閱讀時間'
+PROP_PUBLISH_DATE = '發布日期'
+PROP_SUMMARY = '核心要點'
+
+# 發布狀態選項
+STATUS_DRAFT = '草稿'
+STATUS_PUBLISHED = '已發布'
+
+# Notion 每次請求最多接受的子區塊數量
+NOTION_MAX_CHILDREN = 100
+
+# Notion 單個文字物件的長度上限
+NOTION_MAX_TEXT_LENGTH = 2000
+
+# Notion 區塊構建
+def _rich_text(content: str) -> List[Dict[str, Any]]:
+    """按長度上限切分為多個文字物件，長段落不再被截斷"""
+    return [
+        {"type": "text", "text": {"content": content[start:start + NOTION_MAX_TEXT_LENGTH]}}
+        for start in range(0, len(content), NOTION_MAX_TEXT_LENGTH)
+    ] or [{"type": "text", "text": {"content": ""}}]
+
+def _paragraph_block(text: str) -> Dict[str, Any]:
+    return {"object": "block", "type": "paragraph", "paragraph": {"rich_text": _rich_text(text)}}
+
+def _heading_block(level: int, text: str) -> Dict[str, Any]:
+    block_type = "heading_1" if level == 1 else "heading_2"
+    return {"object": "block", "type": block_type, block_type: {"rich_text": _rich_text(text)}}
+
+def _paragraph_to_block(paragraph: str) -> Dict[str, Any]:
+    if paragraph.startswith('#'):
+        text = paragraph.lstrip('#')
+        return _heading_block(len(paragraph) - len(text), text.strip())
+    return _paragraph_block(paragraph)
+
+# 讀取文章時支援的區塊類型及其 Markdown 前綴
+_BLOCK_MARKDOWN_PREFIXES = {
+    'paragraph': '',
+    'heading_1': '# ',
+    'heading_2': '## '
+}
+
+def markdown_to_blocks(content: str) -> List[Dict[str, Any]]:
+    """將 Markdown 內容按空行分段並轉換為 Notion 區塊"""
+    paragraphs = (paragraph.strip() for paragraph in content.split('\n\n'))
+    return [_paragraph_to_block(paragraph) for paragraph in paragraphs if paragraph]
+
+# Notion I/O 執行緒池（全進程共用）
+_NOTION_EXECUTOR = ThreadPoolExecutor(
+    max_workers=get_settings().notion_pool_size,
+    thread_name_prefix="notion-io"
+)
+
+# Notion 速率限制與暫時性錯誤的重試設定
+NOTION_MAX_RETRIES = 4
+NOTION_RETRY_STATUSES = frozenset({429, 502, 503, 504})
+# 非冪等寫入（建立頁面、追加區塊）只在確定未執行的 429 時重試；
+# 5xx 可能代表寫入已完成，重試會產生重複的頁面或區塊
+NOTION_WRITE_RETRY_STATUSES = frozenset({429})
+
+def _retry_after_seconds(error: HTTPResponseError) -> Optional[float]:
+    """解析 Notion 回傳的 Retry-After 標頭"""
+    retry_after = error.headers.get('retry-after') if error.headers else None
+    try:
+        return float(retry_after) if retry_after else None
+    except ValueError:
+        return None
+
+# Notion 官方平均速率上限為每秒 3 次請求
+NOTION_RATE_LIMIT = 3.0
+
+class TokenBucket:
+    """非同步令牌桶，在送出請求前主動節流，避免觸發 429"""
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self._rate = rate
+        self._capacity = capacity or max(rate, 1.0)  # 至少容納一個令牌，低速率時才能取得
+        self._tokens = self._capacity
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self._capacity, self._tokens + (now - self._updated_at) * self._rate)
+                self._updated_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self._rate)
+
+# 全局 Notion 請求令牌桶；令牌桶只在進程內共享，多 worker 時按進程數平分上限
+notion_rate_limiter = TokenBucket(NOTION_RATE_LIMIT / max(get_settings().workers, 1))
+
+async def run_notion(func, *args, idempotent: bool = True, **kwargs):
+    """在共用執行緒池中執行同步的 Notion API 調用，避免阻塞事件循環
+    
+    idempotent=False 用於非冪等寫入，此時不重試伺服器錯誤
+    """
+    loop = asyncio.get_running_loop()
+    # run_in_executor 只接受位置參數，Notion 端點的參數以 partial 綁定
+    func = partial(func, **kwargs)
+    
+    retry_statuses = NOTION_RETRY_STATUSES if idempotent else NOTION_WRITE_RETRY_STATUSES
+    retry_delay = 1
+    for attempt in range(NOTION_MAX_RETRIES):
+        await notion_rate_limiter.acquire()
+        try:
+            return await loop.run_in_executor(_NOTION_EXECUTOR, func, *args)
+        except HTTPResponseError as e:
+            if e.status not in retry_statuses or attempt == NOTION_MAX_RETRIES - 1:
+                raise
+            # 優先遵循 Retry-After，否則指數退避
+            await asyncio.sleep(_retry_after_seconds(e) or retry_delay)
+            retry_delay *= 2
+
+async def iter_paginated(func, page_size: int = 100, **params):
+    """按游標分頁遍歷 Notion 列表端點，逐筆產出結果，避免超過單次上限的資料被截斷"""
+    def fetch(start_cursor: Optional[str] = None) -> "asyncio.Task":
+        request_params: Dict[str, Any] = dict(params, page_size=page_size)
+        if start_cursor:
+            request_params['start_cursor'] = start_cursor
+        return asyncio.create_task(run_notion(func, **request_params))
+
+    pending: Optional[asyncio.Task] = fetch()
+    try:
+        while pending is not None:
+            response = await pending
+            # 處理當前頁的同時預取下一頁
+            pending = fetch(response.get('next_cursor')) if response.get('has_more') else None
+            for item in response.get('results', []):
+                yield item
+    finally:
+        if pending is not None:
+            pending.cancel()
+
+async def iter_database_pages(client: Client, database_id: str, page_size: int = 100, **query):
+    """遍歷資料庫的所有頁面"""
+    async for page in iter_paginated(
+        client.databases.query, page_size=page_size, database_id=database_id, **query
+    ):
+        yield page
+
+async def list_block_children(client: Client, block_id: str) -> List[Dict[str, Any]]:
+    """獲取區塊的所有子區塊（單次最多 100 個，需分頁）"""
+    return [block async for block in iter_paginated(client.blocks.children.list, block_id=block_id)]
+
+# Notion 客戶端初始化（全進程只建立一次，重用連線池）
+_notion_client: Optional[Client] = None
+
+def _build_notion_client(notion_token: str) -> Client:
+    # 連線池大小與 notion-io 執行緒池一致，每個工作執行緒都能保持長連線
+    pool_size = get_settings().notion_pool_size
+    http_client = httpx.Client(
+        limits=httpx.Limits(
+            max_connections=pool_size,
+            max_keepalive_connections=pool_size,
+            keepalive_expiry=30.0
+        )
+    )
+    return Client(auth=notion_token, client=http_client)
+
 def get_notion_client():
     settings = get_settings()
     if not settings.notion_token:
         raise HTTPException(status_code=500, detail="Notion API Token 未設置")
-    return Client(auth=settings.notion_token)
+    global _notion_client
+    if _notion_client is None:
+        _notion_client = _build_notion_client(settings.notion_token)
+    return _notion_client
+
+def get_notion_database_id() -> str:
+    """獲取文章資料庫 ID，未設置時在調用 Notion 之前直接失敗"""
+    database_id = get_settings().notion_database_id
+    if not database_id:
+        raise HTTPException(status_code=500, detail="Notion 資料庫 ID 未設置")
+    return database_id
+
+def close_notion_client() -> None:
+    """關閉共用的 Notion 客戶端及其連線池（應用程式關閉時調用）"""
+    global _notion_client
+    if _notion_client is not None:
+        _notion_client.close()
+        _notion_client = None
+
+# Notion 頁面屬性提取
+def _get_title(properties: Dict[str, Any], prop_name: str) -> str:
+    title_list = properties.get(prop_name, {}).get('title')
+    return title_list[0]['plain_text'] if title_list else ""
+
+def _get_rich_text(properties: Dict[str, Any], prop_name: str) -> str:
+    rich_text = properties.get(prop_name, {}).get('rich_text')
+    return rich_text[0]['plain_text'] if rich_text else ""
+
+def _get_select_name(properties: Dict[str, Any], prop_name: str) -> str:
+    select_obj = properties.get(prop_name, {}).get('select')
+    return select_obj['name'] if select_obj else ""
+
+def _get_multi_select_names(properties: Dict[str, Any], prop_name: str) -> List[str]:
+    return [option['name'] for option in properties.get(prop_name, {}).get('multi_select', [])]
+
+def _get_date_start(properties: Dict[str, Any], prop_name: str) -> Optional[str]:
+    date_obj = properties.get(prop_name, {}).get('date')
+    return date_obj['start'] if date_obj else None
+
+# 資料庫結構缓存
+SCHEMA_CACHE_TTL = 600  # 10分鐘，資料庫結構變化不頻繁
+
+def _schema_cache_key(database_id: str) -> str:
+    return f"schema:{database_id}"
+
+async def get_database_schema(client: Client, database_id: str) -> Dict[str, Any]:
+    """獲取資料庫結構，並預先計算每個選擇屬性的選項集合"""
+    cache_key = _schema_cache_key(database_id)
+    schema = cache.get(cache_key)
+    if schema is not None:
+        return schema
+
+    database = await run_notion(client.databases.retrieve, database_id=database_id)
+    properties = database.get('properties', {})
+
+    # 選項集合只在結構載入時建立一次，之後的成員檢查都是 O(1)
+    options_by_prop: Dict[str, frozenset] = {}
+    for prop_name, prop_config in properties.items():
+        prop_type = prop_config.get('type')
+        if prop_type in ('select', 'multi_select'):
+            options = prop_config.get(prop_type, {}).get('options', [])
+            options_by_prop[prop_name] = frozenset(option['name'] for option in options)
+
+    schema = {
+        'properties': properties,
+        'options_by_prop': options_by_prop
+    }
+    cache.set(cache_key, schema, SCHEMA_CACHE_TTL)
+    return schema
+
+def _filter_properties(schema: Dict[str, Any], *names: str) -> Dict[str, Any]:
+    """將屬性名稱轉為查詢參數 filter_properties，讓 Notion 只回傳需要的屬性"""
+    properties = schema['properties']
+    property_ids = [properties[name]['id'] for name in names if name in properties]
+    return {'filter_properties': property_ids} if property_ids else {}
+
+# AI 內容生成服務（全進程共用，重用 Anthropic 客戶端連線）
+_ai_service: Optional[AIContentGenerationService] = None
 
-# AI 內容生成服務
 def get_ai_service():
-    return AIContentGenerationService()
+    global _ai_service
+    if _ai_service is None:
+        _ai_service = AIContentGenerationService()
+    return _ai_service
+
+async def close_ai_service() -> None:
+    """關閉共用的 AI 服務客戶端（應用程式關閉時調用）"""
+    global _ai_service
+    if _ai_service is not None:
+        await _ai_service.anthropic_client.close()
+        _ai_service = None
 
 # 第一個生成端點已刪除，保留下面更完整的版本
 
+# 文章列表缓存（在函數內處理，避免缓存裝飾器與 slowapi 衝突；search/limit 為任意輸入，需限制容量）
+ARTICLES_CACHE_TTL = 120
+ARTICLES_CACHE_MAX_ENTRIES = 256
+articles_cache = BoundedTTLCache(ttl=ARTICLES_CACHE_TTL, max_entries=ARTICLES_CACHE_MAX_ENTRIES)
+
 @router.get("/articles", response_model=ArticleListResponse)
 @limiter.limit("30/minute")  # 限制每分鐘30次請求
-# @cached(ttl=120, key_prefix="articles_list")  # 暫時移除缓存裝飾器避免與slowapi衝突
 async def get_articles(
     request: Request,  # 添加 Request 參數給 slowapi
     limit: int = 20,
@@ -209,29 +534,35 @@ async def get_articles(
     search: Optional[str] = None
 ):
     """獲取文章列表"""
+    # 以 repr 組成鍵，避免參數中含分隔符時不同查詢互相碰撞
+    cache_key = repr((limit, category, search))
+    cached_response = articles_cache.get(cache_key)
+    if cached_response is not None:
+        return cached_response
+    
     try:
         client = get_notion_client()
-        settings = get_settings()
+        database_id = get_notion_database_id()
         
         # 構建查詢條件
         filter_conditions = []
         if category:
             filter_conditions.append({
-                "property": "主題類別",
+                "property": PROP_CATEGORY,
                 "select": {"equals": category}
             })
         
         if search:
             filter_conditions.append({
-                "property": "文章標題",
+                "property": PROP_TITLE,
                 "title": {"contains": search}
             })
         
-        query_params = {
-            "database_id": settings.notion_database_id,
+        query_params: Dict[str, Any] = {
+            "database_id": database_id,
             "page_size": limit,
             "sorts": [
-                {"property": "發布日期", "direction": "descending"}
+                {"property": PROP_PUBLISH_DATE, "direction": "descending"}
             ]
         }
         
@@ -244,61 +575,42 @@ async def get_articles(
                 }
         
         # 查詢 Notion 資料庫
-        response = client.databases.query(**query_params)
+        response = await run_notion(client.databases.query, **query_params)
         
         articles = []
-        categories = {}
+        categories = Counter()
         
         for page in response.get('results', []):
             properties = page.get('properties', {})
             
             # 提取文章信息
-            title = ""
-            if 'title' in properties.get('文章標題', {}):
-                title_list = properties['文章標題']['title']
-                title = title_list[0]['plain_text'] if title_list else ""
-            
-            category_obj = properties.get('主題類別', {}).get('select')
-            category = category_obj['name'] if category_obj else ""
-            
-            status_obj = properties.get('發布狀態', {}).get('select')
-            status = status_obj['name'] if status_obj else ""
-            
-            tags_list = properties.get('標籤', {}).get('multi_select', [])
-            tags = [tag['name'] for tag in tags_list]
-            
-            word_count = properties.get('字數', {}).get('number')
-            reading_time = properties.get('閱讀時間', {}).get('number')
-            
-            publish_date = properties.get('發布日期', {}).get('date')
-            publish_date_str = publish_date['start'] if publish_date else None
-            
-            summary_rich_text = properties.get('核心要點', {}).get('rich_text', [])
-            summary = summary_rich_text[0]['plain_text'] if summary_rich_text else ""
+            category = _get_select_name(properties, PROP_CATEGORY)
             
             article = ArticleResponse(
                 id=page['id'],
-                title=title,
+                title=_get_title(properties, PROP_TITLE),
                 category=category,
-                status=status,
-                tags=tags,
-                word_count=word_count,
-                reading_time=reading_time,
-                publish_date=publish_date_str,
-                summary=summary
+                status=_get_select_name(properties, PROP_STATUS),
+                tags=_get_multi_select_names(properties, PROP_TAGS),
+                word_count=properties.get(PROP_WORD_COUNT, {}).get('number'),
+                reading_time=properties.get(PROP_READING_TIME, {}).get('number'),
+                publish_date=_get_date_start(properties, PROP_PUBLISH_DATE),
+                summary=_get_rich_text(properties, PROP_SUMMARY)
             )
             
             articles.append(article)
             
             # 統計分類
             if category:
-                categories[category] = categories.get(category, 0) + 1
+                categories[category] += 1
         
-        return ArticleListResponse(
+        article_list = ArticleListResponse(
             articles=articles,
             total=len(articles),
-            categories=categories
+            categories=dict(categories)
         )
+        articles_cache.set(cache_key, article_list)
+        return article_list
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"獲取文章列表失敗: {str(e)}")
@@ -310,40 +622,30 @@ async def get_article_content(article_id: str):
     try:
         client = get_notion_client()
         
-        # 獲取頁面內容
-        page = client.pages.retrieve(page_id=article_id)
-        blocks = client.blocks.children.list(block_id=article_id)
+        # 頁面屬性與內容區塊互不依賴，並行獲取
+        page, blocks = await asyncio.gather(
+            run_notion(client.pages.retrieve, page_id=article_id),
+            list_block_children(client, article_id)
+        )
         
         # 提取頁面屬性
         properties = page.get('properties', {})
         
-        title = ""
-        if 'title' in properties.get('文章標題', {}):
-            title_list = properties['文章標題']['title']
-            title = title_list[0]['plain_text'] if title_list else ""
+        title = _get_title(properties, PROP_TITLE)
         
         # 提取文章內容
         content_blocks = []
-        for block in blocks.get('results', []):
+        for block in blocks:
             block_type = block.get('type')
-            if block_type == 'paragraph':
-                text_content = ""
-                for rich_text in block.get('paragraph', {}).get('rich_text', []):
-                    text_content += rich_text.get('plain_text', '')
-                if text_content.strip():
-                    content_blocks.append(text_content)
-            elif block_type == 'heading_1':
-                text_content = ""
-                for rich_text in block.get('heading_1', {}).get('rich_text', []):
-                    text_content += rich_text.get('plain_text', '')
-                if text_content.strip():
-                    content_blocks.append(f"# {text_content}")
-            elif block_type == 'heading_2':
-                text_content = ""
-                for rich_text in block.get('heading_2', {}).get('rich_text', []):
-                    text_content += rich_text.get('plain_text', '')
-                if text_content.strip():
-                    content_blocks.append(f"## {text_content}")
+            prefix = _BLOCK_MARKDOWN_PREFIXES.get(block_type)
+            if prefix is None:
+                continue
+            text_content = "".join(
+                rich_text.get('plain_text', '')
+                for rich_text in block.get(block_type, {}).get('rich_text', [])
+            )
+            if text_content.strip():
+                content_blocks.append(f"{prefix}{text_content}")
         
         content = "\n\n".join(content_blocks)
         
@@ -358,19 +660,18 @@ async def get_article_content(article_id: str):
         raise HTTPException(status_code=500, detail=f"獲取文章內容失敗: {str(e)}")
 
 @router.get("/categories")
-@cached(ttl=600, key_prefix="categories")  # 10分鐘缓存，類別變化不頻繁
 async def get_categories():
     """獲取所有文章分類"""
     try:
         client = get_notion_client()
-        settings = get_settings()
+        database_id = get_notion_database_id()
         
-        # 獲取資料庫結構
-        database = client.databases.retrieve(database_id=settings.notion_database_id)
+        # 獲取資料庫結構（已缓存 10 分鐘，保存新分類時會失效）
+        schema = await get_database_schema(client, database_id)
         
         # 提取分類選項
-        properties = database.get('properties', {})
-        category_property = properties.get('主題類別', {})
+        properties = schema['properties']
+        category_property = properties.get(PROP_CATEGORY, {})
         
         categories = []
         if category_property.get('type') == 'select':
@@ -441,86 +742,112 @@ async def generate_article(request: Request, article_request: ArticleGenerationR
         ai_usage_tracker.track_call(response_time, success=False)
         raise HTTPException(status_code=500, detail=f"文章生成失敗: {str(e)}")
 
+async def _create_article_page(client: Client, database_id: str, article: GeneratedArticleResponse) -> str:
+    """在 Notion 建立文章頁面並寫入全部內容區塊，返回頁面 ID"""
+    # 準備屬性數據
+    properties = {
+        PROP_TITLE: {
+            "title": [{"text": {"content": article.title}}]
+        },
+        PROP_CATEGORY: {
+            "select": {"name": article.category}
+        },
+        PROP_STATUS: {
+            "select": {"name": STATUS_DRAFT}
+        },
+        PROP_TAGS: {
+            "multi_select": [{"name": tag} for tag in article.tags[:3]]
+        },
+        PROP_WORD_COUNT: {
+            "number": article.word_count
+        },
+        PROP_READING_TIME: {
+            "number": article.reading_time
+        },
+        PROP_PUBLISH_DATE: {
+            "date": {"start": date.today().isoformat()}
+        }
+    }
+    
+    # 將內容分段並創建區塊
+    content_blocks = markdown_to_blocks(article.content)
+    
+    # 創建 Notion 頁面
+    response = await run_notion(
+        client.pages.create,
+        idempotent=False,
+        parent={"database_id": database_id},
+        properties=properties,
+        children=content_blocks[:NOTION_MAX_CHILDREN]
+    )
+    
+    # 超出單次上限的區塊分批追加（需保持區塊順序，因此依序執行）
+    try:
+        for start in range(NOTION_MAX_CHILDREN, len(content_blocks), NOTION_MAX_CHILDREN):
+            await run_notion(
+                client.blocks.children.append,
+                idempotent=False,
+                block_id=response['id'],
+                children=content_blocks[start:start + NOTION_MAX_CHILDREN]
+            )
+    except Exception:
+        # 追加失敗時封存不完整的頁面，讓客戶端重試時重新建立完整文章
+        try:
+            await run_notion(client.pages.update, page_id=response['id'], archived=True)
+        except Exception:
+            pass  # 封存失敗時仍回報原本的追加錯誤
+        raise
+    
+    return response['id']
+
 @router.post("/save-generated")
 @limiter.limit("5/minute")  # 限制每分鐘5次保存請求
 async def save_generated_article(request: Request, article: GeneratedArticleResponse):
     """將生成的文章保存到 Notion 資料庫"""
     try:
-        client = get_notion_client()
-        settings = get_settings()
-        
-        # 準備屬性數據
-        properties = {
-            '文章標題': {
-                "title": [{"text": {"content": article.title}}]
-            },
-            '主題類別': {
-                "select": {"name": article.category}
-            },
-            '發布狀態': {
-                "select": {"name": "草稿"}
-            },
-            '標籤': {
-                "multi_select": [{"name": tag} for tag in article.tags[:3]]
-            },
-            '字數': {
-                "number": article.word_count
-            },
-            '閱讀時間': {
-                "number": article.reading_time
-            },
-            '發布日期': {
-                "date": {"start": datetime.now().strftime("%Y-%m-%d")}
+        # 相同文章重複提交時直接返回已建立的頁面；仍在保存中時等待其結果
+        dedup_key = save_deduplicator.make_key(article.title, article.content)
+        while True:
+            existing_page_id = save_deduplicator.get(dedup_key)
+            if existing_page_id is None:
+                pending = save_deduplicator.claim(dedup_key)
+                if pending is None:
+                    break
+                # shield 避免等待者斷線時取消正在進行的保存
+                existing_page_id = await asyncio.shield(pending)
+                if existing_page_id is None:
+                    continue  # 先前的保存失敗，由本請求重新保存
+            return {
+                "success": True,
+                "page_id": existing_page_id,
+                "message": "文章已存在於 Notion 資料庫"
             }
-        }
         
-        # 創建頁面內容
-        content_blocks = []
+        page_id: Optional[str] = None
+        try:
+            client = get_notion_client()
+            database_id = get_notion_database_id()
+            page_id = await _create_article_page(client, database_id, article)
+        finally:
+            save_deduplicator.release(dedup_key, page_id)
         
-        # 將內容分段並創建區塊
-        paragraphs = article.content.split('\n\n')
-        for paragraph in paragraphs[:20]:  # 限制區塊數量
-            if paragraph.strip():
-                if paragraph.startswith('#'):
-                    # 標題區塊
-                    level = paragraph.count('#')
-                    text = paragraph.lstrip('#').strip()
-                    if level == 1:
-                        content_blocks.append({
-                            "object": "block",
-                            "type": "heading_1",
-                            "heading_1": {
-                                "rich_text": [{"type": "text", "text": {"content": text}}]
-                            }
-                        })
-                    else:
-                        content_blocks.append({
-                            "object": "block",
-                            "type": "heading_2", 
-                            "heading_2": {
-                                "rich_text": [{"type": "text", "text": {"content": text}}]
-                            }
-                        })
-                else:
-                    # 段落區塊
-                    content_blocks.append({
-                        "object": "block",
-                        "type": "paragraph",
-                        "paragraph": {
-                            "rich_text": [{"type": "text", "text": {"content": paragraph[:2000]}}]
-                        }
-                    })
-        
-        # 創建 Notion 頁面
-        response = client.pages.create(
-            parent={"database_id": settings.notion_database_id},
-            properties=properties,
-            children=content_blocks
-        )
+        # Notion 會自動建立新的選項，此時缓存的資料庫結構已過期
+        schema = cache.get(_schema_cache_key(database_id))
+        if schema is not None:
+            options_by_prop = schema['options_by_prop']
+            category_options = options_by_prop.get(PROP_CATEGORY, frozenset())
+            tag_options = options_by_prop.get(PROP_TAGS, frozenset())
+            if article.category not in category_options or any(
+                tag not in tag_options for tag in article.tags[:3]
+            ):
+                cache.delete(_schema_cache_key(database_id))
+        
+        # 新文章寫入後文章列表缓存失效
+        articles_cache.clear()
         
         return {
             "success": True,
-            "page_id": response['id'],
+            "page_id": page_id,
             "message": "文章已成功保存到 Notion 資料庫"
         }
         
@@ -533,42 +860,38 @@ async def get_database_stats():
     """獲取資料庫統計信息"""
     try:
         client = get_notion_client()
-        settings = get_settings()
+        database_id = get_notion_database_id()
         
-        # 獲取所有文章
-        response = client.databases.query(
-            database_id=settings.notion_database_id,
-            page_size=100
-        )
-        
-        total_articles = len(response.get('results', []))
-        categories = {}
-        tags_count = {}
+        total_articles = 0
+        categories = Counter()
+        tags_count = Counter()
         total_words = 0
         
-        for page in response.get('results', []):
+        # 只取統計用到的屬性，縮小每頁回應
+        schema = await get_database_schema(client, database_id)
+        query = _filter_properties(schema, PROP_CATEGORY, PROP_TAGS, PROP_WORD_COUNT)
+        
+        # 分頁遍歷所有文章
+        async for page in iter_database_pages(client, database_id, **query):
+            total_articles += 1
             properties = page.get('properties', {})
             
             # 統計分類
-            category_obj = properties.get('主題類別', {}).get('select')
-            if category_obj:
-                category = category_obj['name']
-                categories[category] = categories.get(category, 0) + 1
+            category = _get_select_name(properties, PROP_CATEGORY)
+            if category:
+                categories[category] += 1
             
             # 統計標籤
-            tags_list = properties.get('標籤', {}).get('multi_select', [])
-            for tag_obj in tags_list:
-                tag = tag_obj['name']
-                tags_count[tag] = tags_count.get(tag, 0) + 1
+            tags_count.update(_get_multi_select_names(properties, PROP_TAGS))
             
             # 統計字數
-            word_count = properties.get('字數', {}).get('number', 0)
+            word_count = properties.get(PROP_WORD_COUNT, {}).get('number', 0)
             if word_count:
                 total_words += word_count
         
         # 排序統計數據
-        top_categories = sorted(categories.items(), key=lambda x: x[1], reverse=True)
-        top_tags = sorted(tags_count.items(), key=lambda x: x[1], reverse=True)[:10]
+        top_categories = categories.most_common()
+        top_tags = tags_count.most_common(10)
         
         return {
             "total_articles": total_articles,
@@ -588,23 +911,19 @@ async def generate_sitemap():
     """動態生成網站地圖"""
     try:
         client = get_notion_client()
-        settings = get_settings()
-        
-        # 獲取所有已發布文章
-        response = client.databases.query(
-            database_id=settings.notion_database_id,
-            page_size=100,
-            filter={
-                "property": "發布狀態",
-                "select": {"equals": "已發布"}
-            }
-        )
+        database_id = get_notion_database_id()
+        
+        # 已發布文章篩選條件
+        published_filter = {
+            "property": PROP_STATUS,
+            "select": {"equals": STATUS_PUBLISHED}
+        }
         
         # 生成 XML sitemap
         base_url = "http://localhost:8000"  # 生產環境需要更改
         current_time = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S+00:00')
         
-        sitemap_xml = f'''<?xml version="1.0" encoding="UTF-8"?>
+        sitemap_parts = [f'''<?xml version="1.0" encoding="UTF-8"?>
 <urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
     <!-- 主頁 -->
     <url>
@@ -614,31 +933,37 @@ async def generate_sitemap():
         <priority>1.0</priority>
     </url>
     
-    <!-- 文章頁面 -->'''
+    <!-- 文章頁面 -->''']
         
-        for page in response.get('results', []):
+        # 網站地圖只需要發布日期
+        schema = await get_database_schema(client, database_id)
+        query = _filter_properties(schema, PROP_PUBLISH_DATE)
+        
+        async for page in iter_database_pages(
+            client, database_id, filter=published_filter, **query
+        ):
             properties = page.get('properties', {})
             
             # 獲取發布日期
-            publish_date = properties.get('發布日期', {}).get('date')
+            publish_date = _get_date_start(properties, PROP_PUBLISH_DATE)
             if publish_date:
-                last_modified = publish_date['start'] + 'T00:00:00+00:00'
+                last_modified = publish_date + 'T00:00:00+00:00'
             else:
                 last_modified = current_time
             
-            sitemap_xml += f'''
+            sitemap_parts.append(f'''
     <url>
         <loc>{base_url}/article/{page['id']}</loc>
         <lastmod>{last_modified}</lastmod>
         <changefreq>weekly</changefreq>
         <priority>0.8</priority>
-    </url>'''
+    </url>''')
         
-        sitemap_xml += '''
-</urlset>'''
+        sitemap_parts.append('''
+</urlset>''')
         
         return Response(
-            content=sitemap_xml,
+            content=''.join(sitemap_parts),
             media_type="application/xml",
             headers={"Cache-Control": "public, max-age=3600"}  # 緩存1小時
         )
@@ -653,27 +978,16 @@ async def get_article_metadata(article_id: str):
         client = get_notion_client()
         
         # 獲取頁面詳情
-        page = client.pages.retrieve(page_id=article_id)
+        page = await run_notion(client.pages.retrieve, page_id=article_id)
         properties = page.get('properties', {})
         
         # 提取文章信息
-        title = ""
-        if 'title' in properties.get('文章標題', {}):
-            title_list = properties['文章標題']['title']
-            title = title_list[0]['plain_text'] if title_list else ""
-        
-        category = properties.get('主題類別', {}).get('select', {}).get('name', '')
-        
-        tags_list = properties.get('標籤', {}).get('multi_select', [])
-        tags = [tag['name'] for tag in tags_list]
-        
-        word_count = properties.get('字數', {}).get('number', 0)
-        
-        summary_rich_text = properties.get('核心要點', {}).get('rich_text', [])
-        summary = summary_rich_text[0]['plain_text'] if summary_rich_text else ""
-        
-        publish_date = properties.get('發布日期', {}).get('date')
-        publish_date_str = publish_date['start'] if publish_date else None
+        title = _get_title(properties, PROP_TITLE)
+        category = _get_select_name(properties, PROP_CATEGORY)
+        tags = _get_multi_select_names(properties, PROP_TAGS)
+        word_count = properties.get(PROP_WORD_COUNT, {}).get('number', 0)
+        summary = _get_rich_text(properties, PROP_SUMMARY)
+        publish_date_str = _get_date_start(properties, PROP_PUBLISH_DATE)
         
         # 生成適合SEO的描述
         seo_description = summary or f"探索{category}相關的財商知識，包含{', '.join(tags[:3])}等重要概念。{word_count}字深度解析，助您提升財商思維。"
@@ -707,6 +1021,7 @@ async def get_cache_stats():
 async def clear_cache():
     """清理所有缓存"""
     cache.clear()
+    articles_cache.clear()
     return {"message": "缓存已清理", "status": "success"}
 
 @router.delete("/cache/key/{cache_key}")
@@ -2,7 +2,7 @@
 
 import os
 from typing import List, Optional
-from pydantic import Field
+from pydantic import AliasChoices, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -23,6 +23,8 @@ class Settings(BaseSettings):
     api_v1_prefix: str = Field(default="/api/v1")
     host: str = Field(default="0.0.0.0")
     port: int = Field(default=8000)
+    # >1 時以多進程運行（不啟用自動重載）；同時接受常見的 WEB_CONCURRENCY 環境變數
+    workers: int = Field(default=1, validation_alias=AliasChoices("workers", "web_concurrency"))
     
     # Security
     secret_key: str = Field(default="your-secret-key-change-in-production")
@@ -78,6 +80,7 @@ class Settings(BaseSettings):
     # Notion Configuration - Simplified Single Database
     notion_token: Optional[str] = Field(default=None, alias="NOTION_TOKEN")
     notion_database_id: Optional[str] = Field(default=None, alias="NOTION_DATABASE_ID")
+    notion_pool_size: int = Field(default=16)
     
     # Monitoring
     grafana_password: str = Field(default="admin")
@@ -3,7 +3,6 @@
 基於現有的 AI 服務，專門針對財商教育文章生成
 """
 
-import re
 import asyncio
 import random
 from typing import Dict, Any, List, Optional
@@ -16,6 +15,71 @@ from app.core.config import get_settings
 
 logger = structlog.get_logger()
 
+# 字數統計時忽略的 Markdown 符號與空白
+_WORD_COUNT_STRIP_TABLE = str.maketrans('', '', '#*`-\n\r ')
+
+# 文章標準標籤
+_BASE_KEYWORDS = ('財富思維', '個人成長', '投資理財')
+
+# 主題關鍵字對應的額外標籤
+_TOPIC_KEYWORD_TAGS = (
+    ('複利', '複利效應'),
+    ('風險', '風險管理'),
+    ('投資', '投資策略'),
+    ('時間', '時間管理'),
+)
+
+# 文章分類關鍵字，依優先順序排列（先命中者優先）
+_CATEGORY_KEYWORDS = (
+    ('風險管理', ('風險', '管理', '波動', '情緒', '心理')),
+    ('思維轉換', ('複利', '規劃', '思維', '認知', '周期')),
+    ('實戰技巧', ('收入', '變現', '創業', '技能', '品牌')),
+    ('心理素質', ('習慣', '心理', '教育', '傳承', '學習')),
+    ('財富建構', ('財富', '投資', '資產', '配置')),
+)
+_DEFAULT_CATEGORY = '財富建構'
+
+# 隨機選擇專家身份背景（避免重複）
+_EXPERT_BACKGROUNDS = (
+    "你是一位擁有15年經驗的資深財富教練和商業策略專家",
+    "你是一位在華爾街工作12年的資深投資顧問，現為獨立財富管理專家",
+    "你是一位曾協助超過1000位客戶實現財務自由的資深理財規劃師",
+    "你是一位擁有豐富創業和投資經驗的財商教育專家，專精於行為經濟學",
+    "你是一位在金融業耕耘18年的資深分析師，現專注於個人財富成長指導"
+)
+
+# 隨機選擇引言風格（避免千篇一律）
+_INTRO_STYLES = (
+    "以一個發人深省的問題或當前財經趨勢開場，強調主題的時代重要性",
+    "分享一個簡短但有力的真實案例，展現主題對個人財務的實際影響",
+    "從最新的經濟數據或市場變化切入，說明為什麼現在討論這個主題特別重要",
+    "以一個常見的財務迷思或誤區開始，然後導向正確的思維方式",
+    "引用一個著名投資人或經濟學家的洞察，連結到文章主題的核心價值"
+)
+
+# 隨機選擇寫作語調變化
+_TONE_VARIATIONS = (
+    "語調溫和但堅定，如同經驗豐富的導師在分享人生智慧",
+    "語調專業且充滿洞察，如同資深顧問在提供戰略建議",
+    "語調親近且實用，如同可信賴的朋友在分享成功心得",
+    "語調激勵且富有遠見，如同成功企業家在啟發他人",
+    "語調理性且深刻，如同學者型專家在傳授核心原理"
+)
+
+# 隨機選擇案例風格
+_CASE_STYLES = (
+    "分析一個具體的投資決策過程，展現思維方式的重要性",
+    "描述一位客戶的財富轉變歷程，重點在心態和策略的改變",
+    "解析一個市場事件或經濟現象，提取可應用的智慧",
+    "對比兩種不同做法的結果，突顯正確思維的價值",
+    "追蹤一個長期投資案例，展現複利和時間的力量"
+)
+
+
+def calculate_word_count(content: str) -> int:
+    """計算文章字數（不含 Markdown 符號與空白）"""
+    return len(content.translate(_WORD_COUNT_STRIP_TABLE))
+
 
 class AIContentGenerationService:
     """財商文章 AI 生成服務"""
@@ -127,46 +191,10 @@ class AIContentGenerationService:
         
         focus_areas_text = "、".join(focus_areas) if focus_areas else "財富累積、投資理財、風險管理"
         
-        # 隨機選擇專家身份背景（避免重複）
-        expert_backgrounds = [
-            "你是一位擁有15年經驗的資深財富教練和商業策略專家",
-            "你是一位在華爾街工作12年的資深投資顧問，現為獨立財富管理專家",
-            "你是一位曾協助超過1000位客戶實現財務自由的資深理財規劃師",
-            "你是一位擁有豐富創業和投資經驗的財商教育專家，專精於行為經濟學",
-            "你是一位在金融業耕耘18年的資深分析師，現專注於個人財富成長指導"
-        ]
-        
-        # 隨機選擇引言風格（避免千篇一律）
-        intro_styles = [
-            "以一個發人深省的問題或當前財經趨勢開場，強調主題的時代重要性",
-            "分享一個簡短但有力的真實案例，展現主題對個人財務的實際影響",
-            "從最新的經濟數據或市場變化切入，說明為什麼現在討論這個主題特別重要",
-            "以一個常見的財務迷思或誤區開始，然後導向正確的思維方式",
-            "引用一個著名投資人或經濟學家的洞察，連結到文章主題的核心價值"
-        ]
-        
-        # 隨機選擇寫作語調變化
-        tone_variations = [
-            "語調溫和但堅定，如同經驗豐富的導師在分享人生智慧",
-            "語調專業且充滿洞察，如同資深顧問在提供戰略建議",
-            "語調親近且實用，如同可信賴的朋友在分享成功心得",
-            "語調激勵且富有遠見，如同成功企業家在啟發他人",
-            "語調理性且深刻，如同學者型專家在傳授核心原理"
-        ]
-        
-        # 隨機選擇案例風格
-        case_styles = [
-            "分析一個具體的投資決策過程，展現思維方式的重要性",
-            "描述一位客戶的財富轉變歷程，重點在心態和策略的改變",
-            "解析一個市場事件或經濟現象，提取可應用的智慧",
-            "對比兩種不同做法的結果，突顯正確思維的價值",
-            "追蹤一個長期投資案例，展現複利和時間的力量"
-        ]
-        
-        selected_background = random.choice(expert_backgrounds)
-        selected_intro = random.choice(intro_styles)
-        selected_tone = random.choice(tone_variations)
-        selected_case = random.choice(case_styles)
+        selected_background = random.choice(_EXPERT_BACKGROUNDS)
+        selected_intro = random.choice(_INTRO_STYLES)
+        selected_tone = random.choice(_TONE_VARIATIONS)
+        selected_case = random.choice(_CASE_STYLES)
         
         prompt = f"""{selected_background}。請為「財商成長思維」主題創作一篇深度文章。
 
@@ -215,25 +243,17 @@ class AIContentGenerationService:
         article_content = content.strip()
         
         # 生成標準標籤
-        keywords = ['財富思維', '個人成長', '投資理財']
+        keywords = list(_BASE_KEYWORDS)
         
         # 根據主題添加額外標籤
         topic_lower = request.get('topic', '').lower()
-        if '複利' in topic_lower:
-            keywords.append('複利效應')
-        if '風險' in topic_lower:
-            keywords.append('風險管理')
-        if '投資' in topic_lower:
-            keywords.append('投資策略')
-        if '時間' in topic_lower:
-            keywords.append('時間管理')
+        keywords.extend(tag for keyword, tag in _TOPIC_KEYWORD_TAGS if keyword in topic_lower)
         
         # 保留前5個標籤
         keywords = keywords[:5]
         
         # 計算實際字數
-        text_content = re.sub(r'[#*`\-]', '', article_content)
-        word_count = len(text_content.replace('\n', '').replace('\r', '').replace(' ', ''))
+        word_count = calculate_word_count(article_content)
         
         # 判斷分類
         category = self._categorize_article(article_content, request)
@@ -255,21 +275,11 @@ class AIContentGenerationService:
     def _categorize_article(self, content: str, request: Dict[str, Any]) -> str:
         """根據內容自動分類文章"""
         
-        topic = request.get('topic', '').lower()
-        content_lower = content.lower()
-        
-        if any(keyword in content_lower for keyword in ['風險', '管理', '波動', '情緒', '心理']):
-            return '風險管理'
-        elif any(keyword in content_lower for keyword in ['複利', '規劃', '思維', '認知', '周期']):
-            return '思維轉換'
-        elif any(keyword in content_lower for keyword in ['收入', '變現', '創業', '技能', '品牌']):
-            return '實戰技巧'
-        elif any(keyword in content_lower for keyword in ['習慣', '心理', '教育', '傳承', '學習']):
-            return '心理素質'
-        elif any(keyword in content_lower for keyword in ['財富', '投資', '資產', '配置']):
-            return '財富建構'
-        else:
-            return '財富建構'
+        # 依優先順序返回第一個命中關鍵字的分類
+        for category, keywords in _CATEGORY_KEYWORDS:
+            if any(keyword in content for keyword in keywords):
+                return category
+        return _DEFAULT_CATEGORY
     
     async def _evaluate_article_quality(self, content: str) -> float:
         """評估文章品質分數"""
@@ -374,7 +384,7 @@ class AIContentGenerationService:
     async def generate_article_variations(self, base_request: Dict[str, Any], count: int = 3) -> Dict[str, Any]:
         """生成同主題的多個文章變體"""
         try:
-            variations = []
+            variation_requests = []
             
             for i in range(count):
                 # 稍微調整寫作風格和焦點
@@ -385,10 +395,13 @@ class AIContentGenerationService:
                 elif i == 2:
                     variation_request['writing_style'] = '歷史洞察'
                 
-                # 生成變體
-                result = await self.generate_financial_article(variation_request)
-                if result.get('success'):
-                    variations.append(result['data'])
+                variation_requests.append(variation_request)
+            
+            # 各變體互不依賴，並行生成
+            results = await asyncio.gather(
+                *(self.generate_financial_article(request) for request in variation_requests)
+            )
+            variations = [result['data'] for result in results if result.get('success')]
             
             return {
                 'success': True,
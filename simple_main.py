@@ -2,76 +2,211 @@
 簡化的主應用程序，只包含核心功能
 """
 
-from fastapi import FastAPI
+import gzip
+import hashlib
+import inspect
+import json
+from contextlib import asynccontextmanager
+from typing import Any, Callable, List
+
+import orjson
+from fastapi import FastAPI, Request
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import ORJSONResponse, RedirectResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 
+from app.core.config import get_settings
+
+# 應用關閉時依序執行的清理函數（由各模組在載入成功後註冊）
+_shutdown_hooks: List[Callable[[], Any]] = []
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """應用生命週期：關閉時釋放共用的連線資源"""
+    yield
+    for hook in _shutdown_hooks:
+        # 單一清理失敗不應阻止其餘資源釋放
+        try:
+            result = hook()
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            print(f"關閉時清理失敗 ({hook.__name__}): {e}")
+
 # 創建基本的 FastAPI 應用
 app = FastAPI(
     title="財商成長思維平台",
     description="智能文章生成和管理平台",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse  # 以 orjson 序列化所有 JSON 回應
 )
 
 # CORS 中介軟體
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    # 明確的來源清單，讓 Starlette 直接做集合比對，而非對每個請求回寫萬用來源
+    allow_origins=json.loads(get_settings().cors_origins),
     allow_credentials=True,
-    allow_methods=["*"],
+    allow_methods=("GET", "POST", "DELETE", "OPTIONS"),
     allow_headers=["*"],
+    max_age=86400,  # 預檢結果快取一天，減少重複的 OPTIONS 請求
 )
 
+# 由 _page_response 自行選擇編碼與 ETag 的頁面路徑
+_PRECOMPRESSED_PATHS = frozenset({"/", "/analytics", "/dashboard", "/robots.txt"})
+
+class _DynamicGZipMiddleware(GZipMiddleware):
+    """只壓縮動態回應；預先壓縮的頁面直接放行，避免覆蓋其編碼選擇與 ETag"""
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "http" and scope["path"] in _PRECOMPRESSED_PATHS:
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+# 壓縮 API 的 JSON 回應、XML 網站地圖與 /static 資源
+app.add_middleware(_DynamicGZipMiddleware, minimum_size=1000, compresslevel=6)
+
 # 靜態文件
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
+# 啟動時預先載入頁面，並計算 gzip 壓縮內容與 ETag
+def _load_page(path: str, media_type: str) -> dict:
+    with open(path, "rb") as f:
+        body = f.read()
+    # 僅作為內容指紋，標記為非安全用途，避免在 FIPS 模式主機上失敗
+    digest = hashlib.md5(body, usedforsecurity=False).hexdigest()
+    return {
+        "body": body,
+        "etag": f'"{digest}"',
+        "gzip_body": gzip.compress(body, compresslevel=6),
+        "gzip_etag": f'"{digest}-gzip"',
+        "media_type": media_type
+    }
+
+_PAGES = {
+    "index": _load_page("static/index.html", "text/html"),
+    "analytics": _load_page("static/analytics.html", "text/html"),
+    "dashboard": _load_page("static/dashboard.html", "text/html"),
+    "robots": _load_page("static/robots.txt", "text/plain")
+}
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """解析 Accept-Encoding，gzip（或 *）的 q 值大於 0 時才視為接受"""
+    wildcard_q = None
+    for part in accept_encoding.split(","):
+        coding, _, params = part.partition(";")
+        coding = coding.strip().lower()
+        if coding not in ("gzip", "*"):
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.lower().startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if coding == "gzip":
+            return q > 0
+        wildcard_q = q
+    return wildcard_q is not None and wildcard_q > 0
+
+def _page_response(request: Request, name: str) -> Response:
+    """返回預先載入的頁面，支援 gzip 與 If-None-Match"""
+    page = _PAGES[name]
+    headers = {"Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+    if _accepts_gzip(request.headers.get("accept-encoding", "")):
+        body, etag = page["gzip_body"], page["gzip_etag"]
+        headers["Content-Encoding"] = "gzip"
+    else:
+        body, etag = page["body"], page["etag"]
+    headers["ETag"] = etag
+    
+    if request.headers.get("if-none-match") == etag:
+        headers.pop("Content-Encoding", None)
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type=page["media_type"], headers=headers)
+
 @app.get("/")
-async def serve_index():
+async def serve_index(request: Request):
     """提供主頁面"""
-    return FileResponse("static/index.html")
+    return _page_response(request, "index")
 
 @app.get("/analytics")
-async def serve_analytics():
+async def serve_analytics(request: Request):
     """提供分析頁面"""
-    return FileResponse("static/analytics.html")
+    return _page_response(request, "analytics")
 
 @app.get("/dashboard")
-async def serve_dashboard():
+async def serve_dashboard(request: Request):
     """提供資料統計儀表板"""
-    return FileResponse("static/dashboard.html")
+    return _page_response(request, "dashboard")
+
+# 健康檢查內容固定不變，啟動時序列化一次
+_HEALTH_BODY = orjson.dumps({"status": "healthy", "service": "financial-wisdom-platform"})
 
 @app.get("/health")
 async def health_check():
     """健康檢查"""
-    return {"status": "healthy", "service": "financial-wisdom-platform"}
+    # 每次建立新的 Response，避免中介軟體修改共用實例的標頭
+    return Response(content=_HEALTH_BODY, media_type="application/json")
 
 @app.get("/robots.txt")
-async def robots_txt():
+async def robots_txt(request: Request):
     """提供 robots.txt 文件"""
-    return FileResponse("static/robots.txt", media_type="text/plain")
+    return _page_response(request, "robots")
 
 @app.get("/sitemap.xml")
 async def sitemap_xml():
     """重定向到動態生成的 sitemap"""
-    from fastapi.responses import RedirectResponse
-    return RedirectResponse(url="/api/v1/financial-wisdom/sitemap.xml")
+    # 永久重定向並允許爬蟲快取一天，減少重複請求
+    return RedirectResponse(
+        url="/api/v1/financial-wisdom/sitemap.xml",
+        status_code=301,
+        headers={"Cache-Control": "public, max-age=86400"}
+    )
 
 # 導入 Notion API 路由
 try:
-    from app.api.notion_web_endpoints import router as web_router, limiter
+    from app.api.notion_web_endpoints import (
+        router as web_router, limiter, close_notion_client, close_ai_service
+    )
     app.include_router(web_router)
     
+    # 關閉時釋放共用的 Notion 與 AI 服務連線
+    _shutdown_hooks.extend((close_notion_client, close_ai_service))
+    
     # 註冊速率限制錯誤處理器
     app.state.limiter = limiter
     app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
     
-except ImportError as e:
-    print(f"無法導入 Notion 路由: {e}")
+except ModuleNotFoundError as e:
+    # 只在缺少第三方套件時降級運行；專案內部模組的錯誤直接拋出，避免掩蓋真正的錯誤
+    if e.name is None or e.name.split(".")[0] == "app":
+        raise
+    print(f"無法導入 Notion 路由（缺少套件 {e.name}）: {e}")
     print("將在沒有完整功能的情況下運行基本伺服器")
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run("simple_main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+    settings = get_settings()
+    
+    # loop/http 為 "auto" 時，已安裝 uvloop 與 httptools 即自動使用，否則回退到 asyncio 與 h11
+    if settings.workers > 1:
+        # 生產模式：多個 worker 進程分攤請求，進程崩潰時由 uvicorn 重啟
+        uvicorn.run(
+            "simple_main:app", host=settings.host, port=settings.port,
+            workers=settings.workers, loop="auto", http="auto",
+            # 閒置連線保留 75 秒（長於常見負載平衡器的 60 秒），避免重複握手
+            timeout_keep_alive=75,
+            limit_concurrency=2000,
+            backlog=4096
+        )
+    else:
+        uvicorn.run(
+            "simple_main:app", host=settings.host, port=settings.port,
+            reload=True, loop="auto", http="auto"
+        )
\ No newline at end of file
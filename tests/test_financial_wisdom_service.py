@@ -0,0 +1,20 @@
+"""
+財商文章生成服務測試
+"""
+
+from app.services.financial_wisdom_service import AIContentGenerationService
+
+
+def _categorize(content: str) -> str:
+    # 分類不依賴實例狀態，略過 __init__ 以免建立 Anthropic 客戶端
+    service = AIContentGenerationService.__new__(AIContentGenerationService)
+    return service._categorize_article(content, {})
+
+
+def test_categorize_prefers_higher_priority_category():
+    assert _categorize('學習如何控制情緒') == '風險管理'
+    assert _categorize('用複利思維規劃收入') == '思維轉換'
+    assert _categorize('打造個人品牌並持續學習') == '實戰技巧'
+    assert _categorize('養成存錢的習慣') == '心理素質'
+    assert _categorize('資產配置入門') == '財富建構'
+    assert _categorize('沒有任何關鍵字') == '財富建構'
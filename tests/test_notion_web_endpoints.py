@@ -0,0 +1,139 @@
+"""
+Notion Web API 端點測試
+"""
+
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import notion_web_endpoints as endpoints
+
+
+@pytest.fixture
+def notion_client(monkeypatch):
+    """替換共用的 Notion 客戶端與資料庫 ID"""
+    client = MagicMock()
+    monkeypatch.setattr(endpoints, "get_notion_client", lambda: client)
+    monkeypatch.setattr(endpoints, "get_notion_database_id", lambda: "test-database")
+    return client
+
+
+@pytest.fixture
+def api_client():
+    app = FastAPI()
+    app.state.limiter = endpoints.limiter
+    app.include_router(endpoints.router)
+    return TestClient(app)
+
+
+def test_save_archives_partial_page_when_append_fails(notion_client, api_client):
+    """追加區塊失敗時封存不完整的頁面，且不記錄去重，讓重試能重新建立文章"""
+    notion_client.pages.create.return_value = {"id": "partial-page"}
+    notion_client.blocks.children.append.side_effect = RuntimeError("append failed")
+
+    # 超過單次建立上限的段落數，迫使後續分批追加
+    content = "\n\n".join(f"第 {i} 段" for i in range(endpoints.NOTION_MAX_CHILDREN + 50))
+    article = {
+        "title": "部分寫入測試",
+        "content": content,
+        "category": "財富建構",
+        "tags": ["測試"],
+        "word_count": len(content),
+        "reading_time": 5,
+        "quality_score": 8.0,
+    }
+
+    response = api_client.post("/api/v1/financial-wisdom/save-generated", json=article)
+
+    assert response.status_code == 500
+    notion_client.pages.create.assert_called_once()
+    notion_client.pages.update.assert_called_once_with(page_id="partial-page", archived=True)
+    dedup_key = endpoints.save_deduplicator.make_key(article["title"], article["content"])
+    assert endpoints.save_deduplicator.get(dedup_key) is None
+
+
+def _to_read_block(block):
+    """將寫入格式的區塊轉為 Notion 讀取時回傳的格式"""
+    block_type = block["type"]
+    rich_text = [
+        {"plain_text": item["text"]["content"]}
+        for item in block[block_type]["rich_text"]
+    ]
+    return {"type": block_type, block_type: {"rich_text": rich_text}}
+
+
+def test_long_article_round_trips_through_block_pagination(notion_client, api_client):
+    """超過 100 個區塊的文章保存後，讀取時應分頁取回全部內容"""
+    stored_blocks = []
+
+    def create_page(parent, properties, children):
+        stored_blocks.extend(children)
+        return {"id": "long-page"}
+
+    def append_children(block_id, children):
+        stored_blocks.extend(children)
+        return {}
+
+    def list_children(block_id, page_size=100, start_cursor=None):
+        start = int(start_cursor or 0)
+        end = start + page_size
+        has_more = end < len(stored_blocks)
+        return {
+            "results": [_to_read_block(block) for block in stored_blocks[start:end]],
+            "has_more": has_more,
+            "next_cursor": str(end) if has_more else None,
+        }
+
+    notion_client.pages.create.side_effect = create_page
+    notion_client.blocks.children.append.side_effect = append_children
+    notion_client.blocks.children.list.side_effect = list_children
+    notion_client.pages.retrieve.return_value = {"properties": {}}
+
+    paragraphs = [f"長文第 {i} 段" for i in range(endpoints.NOTION_MAX_CHILDREN * 2 + 30)]
+    content = "\n\n".join(paragraphs)
+    article = {
+        "title": "分頁讀取測試",
+        "content": content,
+        "category": "財富建構",
+        "tags": ["測試"],
+        "word_count": len(content),
+        "reading_time": 10,
+        "quality_score": 8.0,
+    }
+
+    save_response = api_client.post("/api/v1/financial-wisdom/save-generated", json=article)
+    assert save_response.status_code == 200
+    assert len(stored_blocks) == len(paragraphs)
+
+    read_response = api_client.get("/api/v1/financial-wisdom/articles/long-page")
+    assert read_response.status_code == 200
+    assert read_response.json()["content"].split("\n\n") == paragraphs
+    assert notion_client.blocks.children.list.call_count == 3
+
+
+def test_save_key_covers_full_content():
+    """標題與開頭相同但內容不同的文章不應被視為重複"""
+    opening = "相同開頭" * 500
+    first = endpoints.SaveDeduplicator.make_key("標題", opening + "原版結尾")
+    second = endpoints.SaveDeduplicator.make_key("標題", opening + "修改後結尾")
+    assert first != second
+
+
+def test_in_flight_save_is_shared_with_retries():
+    """保存進行中的重試應等待同一個結果，而不是重新建立頁面"""
+    async def scenario():
+        deduplicator = endpoints.SaveDeduplicator()
+        key = deduplicator.make_key("標題", "內容")
+
+        assert deduplicator.claim(key) is None
+        pending = deduplicator.claim(key)
+        assert pending is not None
+
+        deduplicator.release(key, "page-1")
+        assert await pending == "page-1"
+        assert deduplicator.get(key) == "page-1"
+
+    asyncio.run(scenario())
@@ -0,0 +1,35 @@
+"""
+主應用程序頁面回應測試
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+import simple_main
+
+
+@pytest.fixture
+def client():
+    return TestClient(simple_main.app)
+
+
+def test_page_honours_gzip_q_zero(client):
+    """gzip;q=0 應取得未壓縮內容與原始 ETag，不被中介軟體再次壓縮"""
+    page = simple_main._PAGES["index"]
+
+    response = client.get("/", headers={"Accept-Encoding": "gzip;q=0"})
+
+    assert response.status_code == 200
+    assert "content-encoding" not in response.headers
+    assert response.headers["etag"] == page["etag"]
+    assert response.headers.get_list("vary") == ["Accept-Encoding"]
+    assert response.content == page["body"]
+
+
+def test_page_serves_precompressed_gzip(client):
+    page = simple_main._PAGES["index"]
+
+    response = client.get("/", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"] == page["gzip_etag"]